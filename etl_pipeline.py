@@ -1,42 +1,170 @@
 import pandas as pd
 import numpy as np
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import scipy.sparse as sp
+from joblib import Parallel, delayed, dump, load
+import csv
+import itertools
 import logging
+import os
+
+try:
+    from numba import njit, prange
+except ImportError: # Numba is optional; the NumPy path is used without it
+    njit = None
 
 # Configure logging for better insights into the pipeline execution
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _fuse_median_scale(X, medians, means, stds):
+        """
+        Fused median imputation and standardization of X, in place, one column per thread.
+        Each column is read once to find its median, then filled and scaled in two more passes,
+        instead of the separate nanmedian/fill/mean/std/scale passes of the NumPy path.
+        """
+        n_rows, n_cols = X.shape
+        for j in prange(n_cols):
+            col = X[:, j]
+            observed = col[~np.isnan(col)]
+            n = observed.shape[0]
+            if n == 0:
+                median = np.nan
+            else:
+                k = n // 2
+                part = np.partition(observed, k)
+                median = part[k] if n % 2 == 1 else (part[:k].max() + part[k]) / 2.0
+
+            total = 0.0
+            for i in range(n_rows):
+                if np.isnan(col[i]):
+                    col[i] = median
+                total += col[i]
+            mean = total / n_rows
+
+            sq_total = 0.0
+            for i in range(n_rows):
+                sq_total += (col[i] - mean) ** 2
+            std = np.sqrt(sq_total / n_rows)
+            if std == 0.0:
+                std = 1.0 # Constant columns are only centered, as StandardScaler does
+
+            for i in range(n_rows):
+                col[i] = (col[i] - mean) / std
+            medians[j] = median
+            means[j] = mean
+            stds[j] = std
+else:
+    _fuse_median_scale = None
+
 class SalariesETLPipeline:
     """
     A class to encapsulate the ETL process (Extract, Transform, Load)
     specifically tailored for the Salaries.csv dataset.
     """
-    def __init__(self, input_filepath, output_filepath):
+    # Known Salaries.csv schema: numerical columns with the type they are parsed as,
+    # and the categorical columns. These fix the feature split without probing dtypes.
+    NUMERIC_COLUMN_TYPES = {
+        'BasePay': pa.float64(),
+        'OvertimePay': pa.float64(),
+        'OtherPay': pa.float64(),
+        'Benefits': pa.float64(),
+        'TotalPay': pa.float64(),
+        'TotalPayBenefits': pa.float64(),
+        'Year': pa.int32()
+    }
+    NUMERIC_COLS = list(NUMERIC_COLUMN_TYPES)
+    CATEGORICAL_COLS = ['JobTitle', 'Agency']
+
+    # Category that missing categorical values are encoded as
+    MISSING_CATEGORY = '__missing__'
+
+    def __init__(self, input_filepath, output_filepath, output_format=None, n_jobs=None, reuse_fit=False):
         self.input_filepath = input_filepath
         self.output_filepath = output_filepath
+        # 'csv' or 'parquet'; by default taken from the output file extension (Parquet unless it ends in .csv)
+        if output_format is None:
+            output_format = 'csv' if output_filepath.lower().endswith('.csv') else 'parquet'
+        self.output_format = output_format
+        # Fitted statistics and categories are saved next to the output; with reuse_fit=True
+        # a later run loads them and only transforms instead of refitting
+        self.fit_filepath = f"{output_filepath}.fit.joblib"
+        self.reuse_fit = reuse_fit
+        self.n_jobs = n_jobs if n_jobs is not None else os.cpu_count() # Threads used to encode categorical columns
+        self.load_batch_rows = 65536 # Rows densified and written per batch in load_data
+        # Non-missing values kept per numerical column to estimate the median in run_streaming
+        # (the median is exact for columns with at most this many values)
+        self.median_sample_size = 1_000_000
         self.data = None
-        self.preprocessor = None
+        # Transformed output, kept as separate blocks until load_data writes it batch by batch
+        self._passthrough = None # Arrow table of the passthrough columns
+        self._transformed_dense = None # float64 array of the scaled numerical features
+        self._transformed_sparse = None # uint8 CSR matrix of the one-hot encoded features
+        self._feature_names = []
+        # Fitted statistics for the numerical features (median for imputation, mean/std for scaling)
+        self.num_median = None
+        self.num_mean = None
+        self.num_std = None
+        # Fitted categories of each categorical feature (column name -> list of categories)
+        self.cat_categories = {}
+        # Numerical transform generated for the current features and fitted statistics, and what it was generated for
+        self._transform_fast = None
+        self._transform_fast_key = None
         self.numerical_features = []
         self.categorical_features = []
         self.columns_to_drop = ['Notes', 'Status'] # Columns identified as empty or irrelevant from initial inspection
-        # Columns that should be kept as is and not transformed by ColumnTransformer
+        # Columns that should be kept as is and not transformed
         self.pass_through_untransformed_cols = ['Id', 'EmployeeName']
 
+    def _csv_options(self, block_size):
+        """
+        Builds the PyArrow CSV read and convert options for the input file.
+        Returns (read_options, convert_options).
+        """
+        # Read only the header line, so the columns that would be dropped anyway
+        # are never parsed or materialized (projection pushdown into the reader)
+        with open(self.input_filepath, newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f), [])
+        skipped_columns = [col for col in header if col in self.columns_to_drop]
+        if skipped_columns:
+            logging.info(f"Skipping predefined irrelevant columns while reading: {', '.join(skipped_columns)}")
+
+        # Parse with PyArrow's multithreaded reader and cast the messy pay columns
+        # at parse time, so no separate pd.to_numeric pass is needed later
+        convert_options = pacsv.ConvertOptions(
+            include_columns=[col for col in header if col not in self.columns_to_drop],
+            column_types=self.NUMERIC_COLUMN_TYPES,
+            null_values=['', 'Not Provided', 'NA'],
+            strings_can_be_null=True
+        )
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=block_size)
+        return read_options, convert_options
+
     def extract_data(self):
         """
         Extracts data from the specified input filepath (CSV).
         """
         logging.info(f"Extracting data from {self.input_filepath}...")
         try:
-            self.data = pd.read_csv(self.input_filepath)
-            logging.info(f"Data extracted successfully. Initial shape: {self.data.shape}")
-            logging.info("\n--- Initial Data Info ---")
-            self.data.info()
-            logging.info("\n--- Initial Missing Values ---")
-            logging.info(self.data.isnull().sum())
+            read_options, convert_options = self._csv_options(block_size=8 << 20)
+            table = pacsv.read_csv(self.input_filepath, convert_options=convert_options, read_options=read_options)
+            data = table.to_pandas(types_mapper=pd.ArrowDtype)
+            colset = set(data.columns)
+            # Few distinct strings repeated across many rows: store them once as categories.
+            # EmployeeName is only passed through, but the smaller column still helps the output step.
+            # A single astype converts them all with one rebuild of the frame.
+            data = data.astype({col: 'category' for col in self.CATEGORICAL_COLS + ['EmployeeName'] if col in colset})
+            self.data = data
+            logging.info(f"Data extracted successfully. Initial shape: {data.shape}")
+            # Diagnostics scan every cell, so they only run when debug logging is enabled
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("\n--- Initial Data Info ---")
+                data.info()
+                logging.debug("\n--- Initial Missing Values ---")
+                logging.debug(data.isnull().sum())
         except FileNotFoundError:
             logging.error(f"Error: Input file not found at {self.input_filepath}")
             raise
@@ -55,141 +183,331 @@ class SalariesETLPipeline:
 
         logging.info("Cleaning data and defining features...")
 
-        # Drop identified irrelevant columns
-        original_columns = set(self.data.columns)
-        self.data = self.data.drop(columns=[col for col in self.columns_to_drop if col in self.data.columns], errors='ignore')
-        dropped_columns = original_columns - set(self.data.columns)
+        # Work on a local reference and a plain column set; self.data is written back once at the end
+        data = self.data
+        colset = set(data.columns)
+
+        # Drop identified irrelevant columns (extract_data already skips them while reading;
+        # this covers data loaded by other means).
+        # Numeric types were already fixed at parse time, so a single drop is the only
+        # rebuild of the frame here (no per-column reassignment)
+        dropped_columns = [col for col in self.columns_to_drop if col in colset]
         if dropped_columns:
+            data = data.drop(columns=dropped_columns)
+            colset.difference_update(dropped_columns)
             logging.info(f"Dropped predefined irrelevant columns: {', '.join(dropped_columns)}")
         else:
-            logging.info("No predefined irrelevant columns dropped or columns not found.")
+            logging.info("No predefined irrelevant columns left to drop.")
 
-        # Convert potential numeric columns that might be objects due to initial parsing issues
-        # (e.g., empty strings or non-numeric chars)
-        potential_numeric_cols = ['BasePay', 'OvertimePay', 'OtherPay', 'Benefits', 'TotalPay', 'TotalPayBenefits', 'Year']
-        for col in potential_numeric_cols:
-            if col in self.data.columns:
-                # Ensure the column exists before attempting conversion
-                # pd.to_numeric handles non-numeric values by coercing to NaN
-                self.data[col] = pd.to_numeric(self.data[col], errors='coerce')
-                logging.info(f"Converted '{col}' column to numeric (coercing errors to NaN).")
+        # Define features for transformation from the known schema; the numerical columns
+        # were already typed by the CSV reader, so no dtype probing is needed.
+        self.numerical_features = [col for col in self.NUMERIC_COLS if col in colset]
+        self.categorical_features = [col for col in self.CATEGORICAL_COLS if col in colset]
 
-        # Define features for transformation. Exclude explicit passthrough columns from these lists.
-        all_cols_after_initial_drop = [col for col in self.data.columns if col not in self.pass_through_untransformed_cols]
+        # Fall back to dtype detection only for columns outside the known schema.
+        # Exclude explicit passthrough columns from these lists.
+        known_cols = set(self.NUMERIC_COLS + self.CATEGORICAL_COLS + self.pass_through_untransformed_cols)
+        unknown_cols = [col for col in data.columns if col not in known_cols]
+        if unknown_cols:
+            logging.warning(f"Columns not in the known Salaries.csv schema, detecting their types: {unknown_cols}")
+            unknown_df = data[unknown_cols]
+            self.numerical_features += unknown_df.select_dtypes(include=np.number).columns.tolist()
+            self.categorical_features += unknown_df.select_dtypes(include=['object', 'string']).columns.tolist()
 
-        self.numerical_features = self.data[all_cols_after_initial_drop].select_dtypes(include=np.number).columns.tolist()
-        self.categorical_features = self.data[all_cols_after_initial_drop].select_dtypes(include='object').columns.tolist()
+        self.data = data
 
         logging.info(f"Identified Numerical Features for transformation: {self.numerical_features}")
         logging.info(f"Identified Categorical Features for transformation: {self.categorical_features}")
         logging.info(f"Columns to pass through untransformed: {self.pass_through_untransformed_cols}")
 
 
-    def build_preprocessing_pipeline(self):
+    def _fit_transform_numeric(self, df):
         """
-        Builds a Scikit-learn preprocessing pipeline using ColumnTransformer.
-        Remainder is set to 'drop' because we manually handle passthrough columns.
+        Imputes missing numerical values with the column median, then standardizes
+        each column to zero mean and unit variance (same result as SimpleImputer(median)
+        followed by StandardScaler, but done in place on a single float64 array).
+        Uses the fused Numba kernel when Numba is installed.
+        Returns the transformed array and its feature names.
         """
-        if not self.numerical_features and not self.categorical_features:
-            logging.error("No features defined for transformation. Call clean_and_define_features() first.")
-            return
+        vals = df[self.numerical_features].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        names = [f"num__{col}" for col in self.numerical_features]
+
+        if _fuse_median_scale is not None:
+            # Column-major layout so every column the kernel walks is contiguous
+            vals = np.asfortranarray(vals)
+            n_cols = vals.shape[1]
+            self.num_median = np.empty(n_cols)
+            self.num_mean = np.empty(n_cols)
+            self.num_std = np.empty(n_cols)
+            _fuse_median_scale(vals, self.num_median, self.num_mean, self.num_std)
+            return vals, names
+
+        # Median is robust to outliers
+        self.num_median = np.nanmedian(vals, axis=0)
+        inds = np.where(np.isnan(vals))
+        vals[inds] = np.take(self.num_median, inds[1])
+
+        self.num_mean = vals.mean(axis=0)
+        self.num_std = vals.std(axis=0)
+        self.num_std[self.num_std == 0] = 1.0 # Constant columns are only centered, as StandardScaler does
+        vals -= self.num_mean
+        vals /= self.num_std
+
+        return vals, names
+
+    def _transform_numeric(self, df):
+        """
+        Imputes and standardizes the numerical features with the already fitted
+        median/mean/std instead of recomputing them, using the generated _transform_fast.
+        Returns the transformed array and its feature names.
+        """
+        names = [f"num__{col}" for col in self.numerical_features]
+        if not self.numerical_features:
+            return np.empty((len(df), 0)), names
 
-        # Preprocessing for numerical features: impute with median, then scale
-        numerical_transformer = Pipeline(steps=[
-            ('imputer', SimpleImputer(strategy='median')), # Median is robust to outliers
-            ('scaler', StandardScaler())
-        ])
-
-        # Preprocessing for categorical features: impute with most frequent, then one-hot encode
-        categorical_transformer = Pipeline(steps=[
-            ('imputer', SimpleImputer(strategy='most_frequent')),
-            ('onehot', OneHotEncoder(handle_unknown='ignore')) # Handles new categories in future data
-        ])
-
-        # Create a preprocessor using ColumnTransformer.
-        # We explicitly set remainder='drop' because we are manually handling 'Id' and 'EmployeeName'.
-        # This prevents ColumnTransformer from attempting to process these columns itself.
-        self.preprocessor = ColumnTransformer(
-            transformers=[
-                ('num', numerical_transformer, self.numerical_features),
-                ('cat', categorical_transformer, self.categorical_features)
-            ],
-            remainder='drop' # Explicitly drop any columns not specified in transformers
+        key = (tuple(self.numerical_features), self.num_median.tobytes(), self.num_mean.tobytes(), self.num_std.tobytes())
+        if self._transform_fast_key != key:
+            self._transform_fast = self._build_transform_fast()
+            self._transform_fast_key = key
+
+        vals = self._transform_fast(*[df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in self.numerical_features])
+        return vals, names
+
+    def _build_transform_fast(self):
+        """
+        Generates and compiles the numerical transform specialized for the current features
+        and fitted statistics: one argument per column, with the column position and its
+        median/mean/std written into the source as constants, so a call does no lookups,
+        indexing or per-column dispatch. The statistics are not known until fitting, so this
+        is built on the first transform after a fit (or a loaded fit) and then reused.
+        """
+        args = [f"col{j}" for j in range(len(self.numerical_features))]
+        lines = [
+            f"def _transform_fast({', '.join(args)}):",
+            f"    out = np.empty((len(col0), {len(args)}), order='F')"
+        ]
+        for j, (arg, median, mean, std) in enumerate(zip(args, self.num_median, self.num_mean, self.num_std)):
+            lines.append(f"    np.subtract(np.where(np.isnan({arg}), {float(median)!r}, {arg}), {float(mean)!r}, out=out[:, {j}])")
+            lines.append(f"    out[:, {j}] /= {float(std)!r}")
+        lines.append("    return out")
+
+        namespace = {'np': np, 'nan': np.nan, 'inf': np.inf}
+        exec(compile('\n'.join(lines), '<transform_fast>', 'exec'), namespace)
+        return namespace['_transform_fast']
+
+    def _encode_one_cat(self, series, categories=None):
+        """
+        One-hot encodes a single categorical column into a CSR matrix.
+        Missing values get their own MISSING_CATEGORY column instead of being imputed,
+        and each row gets a single uint8 one at its category code, so no dense matrix is built.
+        If categories is given, those fitted categories are used instead of the ones found in the column.
+        Returns the CSR block and its categories.
+        """
+        if categories is None and not isinstance(series.dtype, pd.CategoricalDtype):
+            # A single sorting pass yields both the categories and the codes;
+            # missing values come out as their own last category
+            codes, uniques = pd.factorize(series, sort=True, use_na_sentinel=False)
+            categories = [self.MISSING_CATEGORY if pd.isna(category) else category for category in uniques.tolist()]
+        else:
+            # Columns converted to category dtype in extract_data already carry their codes
+            s = series.astype('category')
+            if s.hasnans:
+                # Adding a category only extends the category index; the codes are not rebuilt
+                s = s.cat.add_categories([self.MISSING_CATEGORY]).fillna(self.MISSING_CATEGORY)
+            if categories is not None:
+                # Values outside the fitted categories get code -1
+                s = s.cat.set_categories(categories)
+            categories = s.cat.categories.tolist()
+            codes = s.cat.codes.to_numpy()
+
+        # Rows without a category (code -1) are left empty, like handle_unknown='ignore'
+        valid = codes >= 0
+        indptr = np.concatenate(([0], np.cumsum(valid)))
+        indices = codes[valid].astype(np.int32)
+        # One-hot values are 0/1: a single unsigned byte per value all the way to the output file
+        data = np.ones(len(indices), dtype=np.uint8)
+        block = sp.csr_matrix((data, indices, indptr), shape=(len(codes), len(categories)))
+
+        return block, categories
+
+    def _encode_categorical(self, df, fitted_categories=None):
+        """
+        One-hot encodes all categorical features and stacks them into one sparse CSR matrix.
+        Columns are encoded in parallel threads; the pandas/NumPy work per column releases the GIL.
+        Categories are fitted from the data unless fitted_categories (column -> categories) is given,
+        and the categories used are stored in self.cat_categories.
+        Returns the matrix and its feature names.
+        """
+        results = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(self._encode_one_cat)(df[col], None if fitted_categories is None else fitted_categories[col])
+            for col in self.categorical_features
         )
-        logging.info("Preprocessing pipeline built successfully with remainder='drop'.")
+        self.cat_categories = {col: categories for col, (_, categories) in zip(self.categorical_features, results)}
+        blocks = [block for block, _ in results]
+        names = [f"cat__{col}_{category}" for col, categories in self.cat_categories.items() for category in categories]
+
+        if not blocks:
+            return sp.csr_matrix((len(df), 0), dtype=np.uint8), names
+        return sp.hstack(blocks, format='csr'), names
+
+    def _save_fit(self):
+        """
+        Saves the fitted numerical statistics and categories to fit_filepath.
+        """
+        fit = {
+            'numerical_features': self.numerical_features,
+            'num_median': self.num_median,
+            'num_mean': self.num_mean,
+            'num_std': self.num_std,
+            'cat_categories': self.cat_categories
+        }
+        dump(fit, self.fit_filepath)
+        logging.info(f"Saved fitted statistics and categories to {self.fit_filepath}")
+
+    def _load_fit(self):
+        """
+        Loads the fitted numerical statistics and categories from fit_filepath.
+        Returns False if there is no saved fit or it does not match the current features.
+        """
+        if not os.path.exists(self.fit_filepath):
+            logging.info(f"No saved fit found at {self.fit_filepath}; fitting from the data.")
+            return False
+
+        fit = load(self.fit_filepath)
+        if fit['numerical_features'] != self.numerical_features or list(fit['cat_categories']) != self.categorical_features:
+            logging.warning(f"Saved fit at {self.fit_filepath} does not match the current features; fitting from the data.")
+            return False
+
+        self.num_median = fit['num_median']
+        self.num_mean = fit['num_mean']
+        self.num_std = fit['num_std']
+        self.cat_categories = fit['cat_categories']
+        logging.info(f"Loaded fitted statistics and categories from {self.fit_filepath}")
+        return True
 
     def transform_data(self):
         """
-        Applies the built preprocessing pipeline to the data.
-        Manually handles columns that should not be transformed by ColumnTransformer.
+        Imputes and scales the numerical features and one-hot encodes the categorical features.
+        Columns that should not be transformed are passed through as is.
         """
         if self.data is None:
             logging.error("Data not loaded. Call extract_data() first.")
             return
-        if self.preprocessor is None:
-            logging.error("Preprocessing pipeline not built. Call build_preprocessing_pipeline() first.")
+        if not self.numerical_features and not self.categorical_features:
+            logging.error("No features defined for transformation. Call clean_and_define_features() first.")
             return
 
         logging.info("Transforming data...")
 
-        # Separate the columns that will be processed by the ColumnTransformer
+        # Separate the columns that will be transformed
         # and those that will be passed through without transformation.
-        
-        # Make a copy of the columns to pass through to avoid SettingWithCopyWarning
-        passthrough_df = self.data[self.pass_through_untransformed_cols].copy()
+        # Neither frame is modified below, so no defensive copies are made:
+        # with copy-on-write these column selections share the underlying data.
+        data = self.data
+        passthrough_df = data[self.pass_through_untransformed_cols]
 
-        # Create the DataFrame containing only the features for ColumnTransformer to process
-        features_df = self.data[self.numerical_features + self.categorical_features].copy()
+        # Create the DataFrame containing only the features to transform
+        features_df = data[self.numerical_features + self.categorical_features]
         
         logging.info(f"Shape of features_df before transformation: {features_df.shape}")
         logging.info(f"Columns in features_df: {features_df.columns.tolist()}")
 
-        # Apply transformation using the preprocessor
-        transformed_features_array = self.preprocessor.fit_transform(features_df)
+        if self.reuse_fit and self._load_fit():
+            # Apply the saved fit; no medians, moments or category sets are recomputed
+            numerical_array, numerical_feature_names = self._transform_numeric(features_df)
+            categorical_matrix, categorical_feature_names = self._encode_categorical(features_df, self.cat_categories)
+        else:
+            # Numerical features are imputed and scaled directly with NumPy
+            numerical_array, numerical_feature_names = self._fit_transform_numeric(features_df)
 
-        # Ensure the output is a dense array before creating DataFrame
-        # ColumnTransformer can return sparse matrices, especially if OneHotEncoder is used
-        if hasattr(transformed_features_array, 'toarray'):
-            transformed_features_array = transformed_features_array.toarray()
-            logging.info("Converted sparse matrix output from ColumnTransformer to dense array.")
+            # Categorical features are one-hot encoded straight into a sparse uint8 matrix
+            categorical_matrix, categorical_feature_names = self._encode_categorical(features_df)
+            self._save_fit()
 
-        logging.info(f"Shape of transformed_features_array: {transformed_features_array.shape}")
-        
-        # Get feature names after transformation (these will be for numerical and one-hot encoded categorical features)
-        transformed_feature_names = self.preprocessor.get_feature_names_out()
-        logging.info(f"Number of transformed_feature_names: {len(transformed_feature_names)}")
-
-        # Create a DataFrame from the transformed features
-        transformed_features_df = pd.DataFrame(
-            transformed_features_array,
-            columns=transformed_feature_names,
-            index=features_df.index # Keep original index for alignment
-        )
+        logging.info(f"Shape of numerical array: {numerical_array.shape}, shape of one-hot matrix: {categorical_matrix.shape}")
+        logging.info(f"Number of transformed_feature_names: {len(numerical_feature_names) + len(categorical_feature_names)}")
 
-        # Concatenate the manually passed-through columns with the transformed features
-        # Ensure indices align for correct concatenation
-        # Using .copy() to ensure independent dataframes and avoid SettingWithCopyWarning
-        self.data = pd.concat([passthrough_df.reset_index(drop=True), transformed_features_df.reset_index(drop=True)], axis=1)
+        # Keep the transformed blocks as they are instead of building one wide DataFrame:
+        # load_data only densifies the one-hot matrix a batch of rows at a time.
+        self._passthrough = pa.Table.from_pandas(passthrough_df, preserve_index=False)
+        # Column-major, so every numerical column of a row batch is a contiguous view
+        # that Arrow wraps without copying (a no-op when to_numpy already returned this layout)
+        self._transformed_dense = np.asfortranarray(numerical_array)
+        self._transformed_sparse = categorical_matrix
+        self._feature_names = numerical_feature_names + categorical_feature_names
+        # The cleaned input frame is no longer needed
+        self.data = None
 
-        logging.info(f"Data transformed successfully. New shape: {self.data.shape}")
-        logging.info("\n--- Sample of Transformed Data ---")
-        logging.info(self.data.head())
+        num_rows = self._passthrough.num_rows
+        num_cols = self._passthrough.num_columns + len(self._feature_names)
+        logging.info(f"Data transformed successfully. New shape: {(num_rows, num_cols)}")
         logging.info("\n--- Transformed Data Info ---")
-        self.data.info()
-        logging.info("\n--- Missing values in Transformed Data ---")
-        logging.info(self.data.isnull().sum())
+        logging.info(f"{len(numerical_feature_names)} float64 numerical columns, "
+                     f"{len(categorical_feature_names)} uint8 one-hot columns with {categorical_matrix.nnz} non-zero entries")
+        # Diagnostics scan the transformed data, so they only run when debug logging is enabled
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("\n--- Sample of Transformed Data ---")
+            logging.debug(self._output_batch(0, 5).to_pandas())
+            logging.debug("\n--- Missing values in Transformed Data ---")
+            # The one-hot columns cannot hold missing values, so only the dense columns are checked
+            logging.debug(pd.concat([
+                passthrough_df.isnull().sum(),
+                pd.Series(np.isnan(numerical_array).sum(axis=0), index=numerical_feature_names)
+            ]))
+
+    def _output_batch(self, start, stop):
+        """
+        Assembles rows [start, stop) of the transformed output as an Arrow table:
+        the passthrough columns, the scaled numerical features and the densified one-hot features.
+        """
+        return self._assemble_output(
+            self._passthrough.slice(start, stop - start),
+            self._transformed_dense[start:stop],
+            self._transformed_sparse[start:stop].toarray(order='F'),
+            self._feature_names
+        )
+
+    def _assemble_output(self, passthrough, dense_block, onehot_block, feature_names):
+        """
+        Joins an Arrow table of passthrough columns with the matching rows of the scaled
+        numerical block and the dense one-hot block into one output Arrow table.
+        """
+        # Both blocks are column-major, so Arrow takes each column as a zero-copy view
+        # and one table is built per batch without any DataFrame concat/consolidation
+        arrays = (passthrough.columns
+                  + [pa.array(dense_block[:, i]) for i in range(dense_block.shape[1])]
+                  + [pa.array(onehot_block[:, i]) for i in range(onehot_block.shape[1])])
+        return pa.Table.from_arrays(arrays, names=passthrough.column_names + feature_names)
+
+    def _open_writer(self, schema):
+        """
+        Opens a CSV or Parquet writer (per output_format) for tables with the given schema.
+        """
+        if self.output_format == 'parquet':
+            # Parquet's dictionary/RLE encoding stores the mostly-zero one-hot columns compactly
+            return pq.ParquetWriter(self.output_filepath, schema, compression='zstd')
+        return pacsv.CSVWriter(self.output_filepath, schema)
 
     def load_data(self):
         """
-        Loads the processed data to the specified output filepath (e.g., CSV).
+        Loads the processed data to the specified output filepath (CSV or Parquet).
+        Rows are assembled and written in batches of load_batch_rows, so peak memory
+        does not grow with the row count. PyArrow formats and writes them in C++.
         """
-        if self.data is None:
+        if self._transformed_sparse is None:
             logging.error("No data to load. Call transform_data() first.")
             return
+        if self.output_format not in ('csv', 'parquet'):
+            logging.error(f"Unsupported output format: {self.output_format}")
+            return
 
         logging.info(f"Loading processed data to {self.output_filepath}...")
         try:
-            self.data.to_csv(self.output_filepath, index=False)
+            with self._open_writer(self._output_batch(0, 0).schema) as writer:
+                num_rows = self._passthrough.num_rows
+                for start in range(0, num_rows, self.load_batch_rows):
+                    # Each batch becomes one Parquet row group (ignored by the CSV writer)
+                    writer.write_table(self._output_batch(start, min(start + self.load_batch_rows, num_rows)))
             logging.info("Processed data loaded successfully.")
         except Exception as e:
             logging.error(f"An error occurred during data loading: {e}")
@@ -202,15 +520,145 @@ class SalariesETLPipeline:
         logging.info("Starting ETL pipeline for Salaries.csv...")
         self.extract_data()
         self.clean_and_define_features()
-        self.build_preprocessing_pipeline()
         self.transform_data()
         self.load_data()
         logging.info("ETL pipeline completed.")
 
+    def _update_reservoir(self, reservoir, seen, values, rng):
+        """
+        Adds values to a uniform random sample of at most median_sample_size values
+        (reservoir sampling), given that seen values were offered before.
+        Returns the updated sample.
+        """
+        take = min(self.median_sample_size - len(reservoir), len(values))
+        reservoir = np.concatenate([reservoir, values[:take]])
+        rest = values[take:]
+        if len(rest):
+            # Value number i replaces a random slot with probability size/(i+1);
+            # on repeated slots the later value wins, as in the sequential algorithm
+            slots = rng.integers(0, seen + take + np.arange(len(rest)) + 1)
+            keep = slots < self.median_sample_size
+            reservoir[slots[keep]] = rest[keep]
+        return reservoir
+
+    def _fit_streaming(self, batches):
+        """
+        Fits the numerical statistics and categories from a stream of Arrow record batches,
+        keeping only running statistics in memory: merged mean/variance of the observed values,
+        a bounded sample for the median, and the set of categories of each column.
+        """
+        n_num = len(self.numerical_features)
+        count = np.zeros(n_num)
+        mean = np.zeros(n_num)
+        m2 = np.zeros(n_num)
+        missing = np.zeros(n_num)
+        reservoirs = [np.empty(0) for _ in range(n_num)]
+        rng = np.random.default_rng(0)
+        categories = {col: set() for col in self.categorical_features}
+        has_missing = {col: False for col in self.categorical_features}
+
+        for batch in batches:
+            features_df = pa.Table.from_batches([batch]).select(self.numerical_features + self.categorical_features).to_pandas(types_mapper=pd.ArrowDtype)
+
+            vals = features_df[self.numerical_features].to_numpy(dtype=np.float64, na_value=np.nan)
+            for j in range(n_num):
+                observed = vals[:, j][~np.isnan(vals[:, j])]
+                missing[j] += len(vals) - len(observed)
+                if len(observed) == 0:
+                    continue
+                # Merge the batch mean/variance into the running ones (Chan et al.)
+                batch_mean = observed.mean()
+                batch_m2 = ((observed - batch_mean) ** 2).sum()
+                total = count[j] + len(observed)
+                delta = batch_mean - mean[j]
+                mean[j] += delta * len(observed) / total
+                m2[j] += batch_m2 + delta ** 2 * count[j] * len(observed) / total
+                reservoirs[j] = self._update_reservoir(reservoirs[j], count[j], observed, rng)
+                count[j] = total
+
+            for col in self.categorical_features:
+                has_missing[col] |= bool(features_df[col].hasnans)
+                categories[col].update(features_df[col].dropna().unique().tolist())
+
+        # Median is robust to outliers
+        self.num_median = np.array([np.median(r) if len(r) else np.nan for r in reservoirs])
+        # Imputed values all equal the median, so they join the moments as one more group with zero spread
+        rows = count + missing
+        self.num_mean = (count * mean + missing * self.num_median) / rows
+        m2 += (self.num_median - mean) ** 2 * count * missing / rows
+        self.num_std = np.sqrt(m2 / rows)
+        self.num_std[self.num_std == 0] = 1.0 # Constant columns are only centered, as StandardScaler does
+
+        self.cat_categories = {
+            col: sorted(categories[col]) + ([self.MISSING_CATEGORY] if has_missing[col] else [])
+            for col in self.categorical_features
+        }
+
+    def _transform_batch(self, table):
+        """
+        Transforms one Arrow table of input rows with the fitted statistics and categories.
+        Returns the output rows as an Arrow table.
+        """
+        features_df = table.select(self.numerical_features + self.categorical_features).to_pandas(types_mapper=pd.ArrowDtype)
+        numerical_array, numerical_feature_names = self._transform_numeric(features_df)
+        categorical_matrix, categorical_feature_names = self._encode_categorical(features_df, self.cat_categories)
+        return self._assemble_output(
+            table.select(self.pass_through_untransformed_cols),
+            np.asfortranarray(numerical_array),
+            categorical_matrix.toarray(order='F'),
+            numerical_feature_names + categorical_feature_names
+        )
+
+    def run_streaming(self):
+        """
+        Executes the ETL pipeline without loading the whole file into memory.
+        The CSV is read as a stream of record batches twice: the first pass fits the
+        statistics and categories (skipped when a saved fit is reused), the second
+        transforms each batch and appends it to the output. Peak memory is bounded by
+        the batch size rather than the dataset size, so files larger than RAM work.
+        """
+        logging.info("Starting streaming ETL pipeline for Salaries.csv...")
+        if self.output_format not in ('csv', 'parquet'):
+            logging.error(f"Unsupported output format: {self.output_format}")
+            return
+
+        try:
+            read_options, convert_options = self._csv_options(block_size=16 << 20)
+            reader = pacsv.open_csv(self.input_filepath, read_options=read_options, convert_options=convert_options)
+            first_table = pa.Table.from_batches([reader.read_next_batch()])
+
+            # Features are defined from the first batch, exactly as for the full frame
+            self.data = first_table.to_pandas(types_mapper=pd.ArrowDtype)
+            self.clean_and_define_features()
+            self.data = None
+
+            if not (self.reuse_fit and self._load_fit()):
+                logging.info("First pass: fitting statistics and categories...")
+                self._fit_streaming(itertools.chain(first_table.to_batches(), reader))
+                self._save_fit()
+
+            logging.info(f"Second pass: transforming and loading data to {self.output_filepath}...")
+            num_rows = 0
+            reader = pacsv.open_csv(self.input_filepath, read_options=read_options, convert_options=convert_options)
+            with self._open_writer(self._transform_batch(first_table.slice(0, 0)).schema) as writer:
+                for batch in reader:
+                    output = self._transform_batch(pa.Table.from_batches([batch]))
+                    writer.write_table(output)
+                    num_rows += output.num_rows
+            logging.info(f"Streaming ETL pipeline completed. Rows written: {num_rows}")
+        except FileNotFoundError:
+            logging.error(f"Error: Input file not found at {self.input_filepath}")
+            raise
+        except Exception as e:
+            logging.error(f"An error occurred during the streaming pipeline: {e}")
+            raise
+
 # --- Main execution ---
 if __name__ == "__main__":
     INPUT_FILE = 'Salaries.csv'
-    OUTPUT_FILE = 'processed_salaries_data.csv'
+    # Parquet is far smaller and faster to write than CSV for the mostly-zero one-hot columns;
+    # use a .csv file name if downstream consumers need CSV
+    OUTPUT_FILE = 'processed_salaries_data.parquet'
 
     # Create an instance of the ETL pipeline and run it
     pipeline = SalariesETLPipeline(
@@ -221,7 +669,10 @@ if __name__ == "__main__":
 
     # Optional: Verify the processed data by loading it
     try:
-        processed_df = pd.read_csv(OUTPUT_FILE)
+        if pipeline.output_format == 'parquet':
+            processed_df = pd.read_parquet(OUTPUT_FILE)
+        else:
+            processed_df = pd.read_csv(OUTPUT_FILE)
         logging.info(f"\n--- Verification: First 5 rows of {OUTPUT_FILE} ---")
         logging.info(processed_df.head())
         logging.info(f"\n--- Verification: Info of {OUTPUT_FILE} ---")